@@ -1,16 +1,96 @@
 from __future__ import annotations
 
-from typing import Sequence
+import atexit
+import os
+import smtplib
+from email.message import EmailMessage
+from typing import Optional, Sequence
+
+# reconnect after this many messages to avoid provider rate-limit disconnects
+_MAX_MESSAGES_PER_CONNECTION = 100
+
+
+class _PooledSMTP:
+    """Lazily-connected SMTP client reused across send_email calls.
+
+    Opening, STARTTLS-ing and logging in for every message pays a full TLS
+    handshake each time; keeping one connection alive amortizes that across
+    a run. A noop() health check triggers a reconnect if the server dropped us.
+    """
+
+    def __init__(self) -> None:
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._sent = 0
+        atexit.register(self.close)
+
+    def _connect(self) -> smtplib.SMTP:
+        host = os.environ["AIRFLOW__SMTP__SMTP_HOST"]
+        port = int(os.environ.get("AIRFLOW__SMTP__SMTP_PORT", "587"))
+        smtp = smtplib.SMTP(host, port, timeout=30)
+        if os.environ.get("AIRFLOW__SMTP__SMTP_STARTTLS", "True").lower() in ("true", "1"):
+            smtp.starttls()
+        user = os.environ.get("AIRFLOW__SMTP__SMTP_USER")
+        password = os.environ.get("AIRFLOW__SMTP__SMTP_PASSWORD")
+        if user and password:
+            smtp.login(user, password)
+        self._sent = 0
+        return smtp
+
+    def send(self, msg: EmailMessage) -> None:
+        if self._smtp is None or self._sent >= _MAX_MESSAGES_PER_CONNECTION:
+            self.close()
+            self._smtp = self._connect()
+        else:
+            try:
+                self._smtp.noop()
+            except Exception:
+                self.close()
+                self._smtp = self._connect()
+        self._smtp.send_message(msg)
+        self._sent += 1
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+
+_SMTP_SINGLETON: Optional[_PooledSMTP] = None
+
+
+def _send_via_smtplib(to: Sequence[str], subject: str, html: str) -> None:
+    """Send via the module-level pooled SMTP connection."""
+    global _SMTP_SINGLETON
+    if _SMTP_SINGLETON is None:
+        _SMTP_SINGLETON = _PooledSMTP()
+
+    msg = EmailMessage()
+    msg["From"] = os.environ.get(
+        "AIRFLOW__SMTP__SMTP_MAIL_FROM",
+        os.environ.get("AIRFLOW__SMTP__SMTP_USER", ""),
+    )
+    msg["To"] = ", ".join(to)
+    msg["Subject"] = subject
+    msg.set_content(html, subtype="html")
+    _SMTP_SINGLETON.send(msg)
 
 
 def send_email(to: Sequence[str], subject: str, html: str) -> None:
-    """Send email using Airflow's send_email helper."""
+    """Send email, reusing a pooled SMTP connection when SMTP env is configured.
+
+    Falls back to Airflow's send_email helper when no SMTP host is set.
+    """
     try:
-        from airflow.utils.email import send_email as airflow_send
-        
-        airflow_send(to=to, subject=subject, html_content=html)
+        if os.environ.get("AIRFLOW__SMTP__SMTP_HOST"):
+            _send_via_smtplib(to, subject, html)
+        else:
+            from airflow.utils.email import send_email as airflow_send
+
+            airflow_send(to=to, subject=subject, html_content=html)
     except Exception as e:
         import logging
         logging.exception(f"Failed to send email: {e}")
         raise
-
@@ -2,42 +2,69 @@
 
 This module contains a single function `run` that mirrors the previous in-DAG
 logic: it fetches pages from the API, resilient to endpoint path changes,
-and writes a timestamped JSON file under /opt/airflow/data/bronze.
+and writes a timestamped Arrow IPC file (plus a raw JSON audit copy)
+under /opt/airflow/data/bronze.
 """
 from __future__ import annotations
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+import pyarrow as pa
 import requests
+from pyarrow import feather
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
-def _fetch_page(base_url: str, page: int, per_page: int) -> List[Dict[str, Any]]:
+def _make_session(pool_maxsize: int = 16) -> requests.Session:
+    """Build the shared session: keep-alive pooled connections plus retries.
+
+    Every page fetch reuses the same TLS socket instead of renegotiating
+    TCP/TLS per request, and transient 429/5xx responses are retried with
+    exponential backoff.
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _fetch_page(session: requests.Session, base_url: str, page: int, per_page: int) -> List[Dict[str, Any]]:
     params = {"page": page, "per_page": per_page}
-    resp = requests.get(base_url, params=params, timeout=30)
+    resp = session.get(base_url, params=params, timeout=30)
     resp.raise_for_status()
     return resp.json()
 
 
-def run(per_page: int = 50, max_pages: int = 5) -> str:
-    """Fetch breweries pages and write raw JSON to bronze folder.
+def run(per_page: int = 50, max_pages: int = 5) -> Dict[str, Any]:
+    """Fetch breweries pages and write raw data to the bronze folder.
 
-    Returns the path to the saved JSON file.
+    Returns a dict with the saved Arrow IPC path and the collected metrics:
+    {"path": ..., "metrics": {...}}. Metrics travel via XCom so the run
+    manifest task can log them in one batch instead of one file per stage.
     """
     # prefer the v1 path, fallback to /breweries
     endpoints = [
         "https://api.openbrewerydb.org/v1/breweries"
     ]
 
+    # one session so every page reuses the pooled (TLS) connection
+    session = _make_session(pool_maxsize=max(16, max_pages))
+
+    # probe by fetching the first real page: picks the endpoint and keeps the data
     items: List[Dict[str, Any]] = []
     base_url = None
     last_exc = None
+    first_page: List[Dict[str, Any]] = []
     for ep in endpoints:
         try:
-            # try a quick HEAD/GET for page=1
-            _ = requests.get(ep, params={"page": 1, "per_page": 1}, timeout=10)
+            first_page = _fetch_page(session, ep, 1, per_page)
             base_url = ep
             break
         except Exception as exc:
@@ -46,37 +73,57 @@ def run(per_page: int = 50, max_pages: int = 5) -> str:
     if base_url is None:
         raise RuntimeError(f"Could not determine OpenBreweryDB endpoint: {last_exc}")
 
-    for page in range(1, max_pages + 1):
+    items.extend(first_page)
+
+    def _safe_fetch(page: int) -> Optional[List[Dict[str, Any]]]:
         try:
-            page_items = _fetch_page(base_url, page, per_page)
+            return _fetch_page(session, base_url, page, per_page)
+        except Exception:
+            return None
+
+    if first_page and max_pages > 1:
+        # fan the remaining page fetches out; pages come back in order from ex.map
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = list(ex.map(_safe_fetch, range(2, max_pages + 1)))
+
+        # stop at the first empty or failed page, like the old sequential loop
+        for page_items in results:
             if not page_items:
                 break
             items.extend(page_items)
-        except Exception:
-            # stop fetching further pages on error
-            break
 
     timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
     out_dir = "/opt/airflow/data/bronze"
     os.makedirs(out_dir, exist_ok=True)
-    filename = f"bronze_breweries_{timestamp}.json"
+    # Arrow IPC (Feather) handoff to silver: skips a JSON serialize+parse cycle
+    filename = f"bronze_breweries_{timestamp}.arrow"
     out_path = os.path.join(out_dir, filename)
-    with open(out_path, "w", encoding="utf-8") as fh:
-        json.dump(items, fh, ensure_ascii=False, indent=2)
+    feather.write_feather(pa.Table.from_pylist(items), out_path)
+
+    # keep a raw JSON copy so the bronze layer stays auditable; orjson dumps in
+    # C and skipping indent roughly halves the bytes written
+    audit_path = os.path.join(out_dir, f"bronze_breweries_{timestamp}.json")
+    try:
+        import orjson
+
+        with open(audit_path, "wb") as fh:
+            fh.write(orjson.dumps(items, option=orjson.OPT_APPEND_NEWLINE))
+    except ImportError:
+        with open(audit_path, "w", encoding="utf-8") as fh:
+            json.dump(items, fh, ensure_ascii=False)
 
     # collect simple data-quality metrics
+    metrics: Dict[str, Any] = {}
     try:
-        from scripts.logging import log_event
+        import pandas as pd
 
         item_count = len(items)
         pages_fetched = 0 if item_count == 0 else ((item_count - 1) // per_page) + 1
-        # detect missing fields across items
-        expected = {"id", "name", "brewery_type", "city", "state", "website_url"}
-        missing_counts = {}
-        for it in items:
-            for f in expected:
-                if f not in it or it.get(f) is None:
-                    missing_counts[f] = missing_counts.get(f, 0) + 1
+        # detect missing fields across items in one vectorized pass
+        expected = ["id", "name", "brewery_type", "city", "state", "website_url"]
+        tmp = pd.DataFrame(items)
+        na_counts = tmp.reindex(columns=expected).isna().sum()
+        missing_counts = {f: int(n) for f, n in na_counts.items() if n > 0}
 
         metrics = {
             "item_count": item_count,
@@ -84,9 +131,8 @@ def run(per_page: int = 50, max_pages: int = 5) -> str:
             "missing_counts": missing_counts,
             "bronze_path": out_path,
         }
-        log_event(stage="bronze", metrics=metrics)
     except Exception:
-        # logging must not fail the pipeline; swallow errors
+        # metrics must not fail the pipeline; swallow errors
         pass
 
-    return out_path
+    return {"path": out_path, "metrics": metrics}
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import json
-import os
 from typing import Any, Dict, List, Optional
 
 from datetime import datetime
@@ -9,32 +8,6 @@ from datetime import datetime
 from scripts.alert import send_email
 
 
-def _find_silver_log(silver_path: str) -> Optional[str]:
-    """Find the most recent logging JSON file whose metrics.silver_path equals the given path."""
-    log_dir = "/opt/airflow/data/logging"
-    if not os.path.isdir(log_dir):
-        return None
-    candidates: List[str] = []
-    for name in os.listdir(log_dir):
-        if not name.endswith(".json"):
-            continue
-        path = os.path.join(log_dir, name)
-        try:
-            with open(path, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
-            metrics = data.get("metrics", {})
-            if metrics.get("silver_path") == silver_path and data.get("stage") == "silver":
-                candidates.append(path)
-        except Exception:
-            continue
-
-    if not candidates:
-        return None
-    # return most recent by filename timestamp
-    candidates.sort()
-    return candidates[-1]
-
-
 def _evaluate_rules(metrics: Dict[str, Any], thresholds: Dict[str, Any]) -> List[str]:
     issues: List[str] = []
     row_count = int(metrics.get("row_count", 0))
@@ -65,12 +38,14 @@ def _evaluate_rules(metrics: Dict[str, Any], thresholds: Dict[str, Any]) -> List
 
 def run(
         silver_path: str,
+        metrics: Optional[Dict[str, Any]] = None,
         recipients: Optional[List[str]] = None,
         thresholds: Optional[Dict[str, Any]] = None,
         fail_on_error: bool = False,
         ) -> Dict[str, Any]:
     """Run data-quality checks for the given silver_path.
 
+    - metrics: the silver stage metrics, handed over via XCom by the DAG
     - recipients: list of emails to notify (if None, uses DEFAULT from env or Airflow DEFAULT_ARGS)
     - thresholds: overrides for rule thresholds
     - fail_on_error: if True, raises Exception when issues found
@@ -80,23 +55,18 @@ def run(
     thresholds = thresholds or {}
     recipients = recipients or []
 
-    log_path = _find_silver_log(silver_path)
-    if log_path is None:
-        # if we can't find a log, warn and optionally fail
-        msg = f"No silver log found for path {silver_path}"
+    if not metrics:
+        # without metrics there is nothing to evaluate; warn and optionally fail
+        msg = f"No silver metrics provided for path {silver_path}"
         if recipients:
             try:
-                send_email(recipients, f"DQ: missing log for {silver_path}", msg)
+                send_email(recipients, f"DQ: missing metrics for {silver_path}", msg)
             except Exception:
                 pass
         if fail_on_error:
             raise RuntimeError(msg)
         return {"status": "warn", "issues": [msg]}
 
-    with open(log_path, "r", encoding="utf-8") as fh:
-        data = json.load(fh)
-    metrics = data.get("metrics", {})
-
     issues = _evaluate_rules(metrics, thresholds)
     if not issues:
         return {"status": "ok", "issues": []}
@@ -120,4 +90,5 @@ def run(
     if fail_on_error:
         raise RuntimeError("; ".join(issues))
 
-    return {"status": "warn", "issues": issues}
+    # keep the XCom payload JSON-native: plain strings only
+    return {"status": "warn", "issues": [str(i) for i in issues]}
@@ -3,40 +3,49 @@ from __future__ import annotations
 import json
 import os
 from datetime import datetime
-from typing import Any
+from typing import Any, Dict
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.dataset as ds
 
+# The aggregate produced by run() always has this exact shape, so the writer
+# can build an Arrow table directly instead of sanitizing a generic frame.
+GOLD_SCHEMA = pa.schema(
+    [
+        ("run_date", pa.string()),
+        ("state", pa.string()),
+        ("brewery_type", pa.string()),
+        ("count", pa.int64()),
+    ]
+)
 
-def _sanitize_for_delta(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    numeric_cols = df.select_dtypes(include=["number", "bool"]).columns.tolist()
-    for col in df.columns:
-        if col in numeric_cols:
-            continue
-        series = df[col]
-        if pd.api.types.is_categorical_dtype(series.dtype):
-            series = series.astype(str)
-        if pd.api.types.is_object_dtype(series.dtype):
-            if series.apply(lambda x: isinstance(x, (dict, list))).any():
-                series = series.apply(lambda x: json.dumps(x, ensure_ascii=False) if x is not None else None)
-            else:
-                series = series.apply(lambda x: None if pd.isna(x) else str(x))
-        if pd.api.types.is_string_dtype(series.dtype) or series.dtype == object:
-            series = series.apply(lambda x: None if pd.isna(x) else str(x))
-        df[col] = series
-    return df
 
+def run(silver_path: str) -> Dict[str, Any]:
+    # project only the two columns the aggregation needs; pre_buffer coalesces
+    # the small footer/page reads across the partitioned files
+    fmt = ds.ParquetFileFormat(
+        default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True)
+    )
+    # prefer the file manifest silver leaves behind: building the dataset from
+    # explicit paths skips the directory LIST and per-file stat calls
+    meta_path = os.path.join(silver_path, "_meta.json")
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        dataset = ds.dataset(meta["files"], format=fmt)
+    else:
+        dataset = ds.dataset(silver_path, format=fmt, partitioning="hive")
+    tbl = dataset.to_table(columns=["state", "brewery_type"])
 
-def run(silver_path: str) -> str:
-    df = pd.read_parquet(silver_path, engine="pyarrow")
-
+    # group by location and type, entirely in Arrow; pandas only sees the result
     agg = (
-        df.groupby(["state", "brewery_type"])  # group by location and type
-        .size()
-        .reset_index(name="count")
-        .sort_values(["state", "count"], ascending=[True, False])
+        tbl.group_by(["state", "brewery_type"])
+        .aggregate([([], "count_all")])
+        .select(["state", "brewery_type", "count_all"])
+        .rename_columns(["state", "brewery_type", "count"])
+        .sort_by([("state", "ascending"), ("count", "descending")])
+        .to_pandas()
     )
 
     run_date = datetime.utcnow().strftime("%Y-%m-%d")
@@ -46,32 +55,23 @@ def run(silver_path: str) -> str:
     delta_root = "/opt/airflow/data/gold_delta"
     os.makedirs(os.path.dirname(delta_root), exist_ok=True)
 
+    metrics: Dict[str, Any] = {
+        "agg_rows": int(len(agg)),
+        "total_count": int(agg["count"].sum()) if "count" in agg.columns else None,
+        "gold_path": delta_root,
+    }
+
     try:
         from deltalake import write_deltalake
 
-        safe_agg = _sanitize_for_delta(agg)
+        table = pa.Table.from_pandas(agg, schema=GOLD_SCHEMA, preserve_index=False)
         mode = "append" if os.path.exists(os.path.join(delta_root, "_delta_log")) else "overwrite"
-        try:
-            write_deltalake(delta_root, safe_agg, mode=mode, partition_by=["run_date"])
-            return delta_root
-        except Exception:
-            safe_table = pa.Table.from_pandas(safe_agg, preserve_index=False)
-            write_deltalake(delta_root, safe_table, mode=mode, partition_by=["run_date"])
-            return delta_root
+        write_deltalake(delta_root, table, mode=mode, partition_by=["run_date"])
+        metrics["delta_write"] = "ok"
     except Exception as exc:
         import logging
 
         logging.warning("Delta write failed; continuing without gold write: %s", exc)
-        # log data-quality / run metrics
-        try:
-            from scripts.logging import log_event
+        metrics["delta_write"] = f"failed: {exc}"
 
-            metrics = {
-                "agg_rows": int(len(agg)),
-                "total_count": int(agg["count"].sum()) if "count" in agg.columns else None,
-                "gold_path": delta_root,
-            }
-            log_event(stage="gold", metrics=metrics)
-        except Exception:
-            pass
-        return delta_root
+    return {"path": delta_root, "metrics": metrics}
@@ -2,8 +2,63 @@ from __future__ import annotations
 
 import json
 import os
+import sqlite3
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+OUT_DIR = "/opt/airflow/data/logging"
+DB_PATH = os.path.join(OUT_DIR, "logs.db")
+
+
+def _connect() -> sqlite3.Connection:
+    """Open (and lazily create) the index database for event lookups."""
+    os.makedirs(OUT_DIR, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS log_index (
+            stage TEXT NOT NULL,
+            silver_path TEXT NOT NULL,
+            log_path TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            ts TEXT NOT NULL,
+            UNIQUE (stage, silver_path)
+        )
+        """
+    )
+    return conn
+
+
+def index_upsert(stage: str, silver_path: str, log_path: str, offset: int) -> None:
+    """Record where the latest event for (stage, silver_path) lives in the JSONL files."""
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO log_index (stage, silver_path, log_path, offset, ts) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (stage, silver_path) DO UPDATE SET "
+                "log_path=excluded.log_path, offset=excluded.offset, ts=excluded.ts",
+                (stage, silver_path, log_path, offset, datetime.utcnow().isoformat()),
+            )
+    finally:
+        conn.close()
+
+
+def index_lookup(stage: str, silver_path: str) -> Optional[Tuple[str, int]]:
+    """Return (log_path, offset) of the latest event for (stage, silver_path), or None."""
+    if not os.path.exists(DB_PATH):
+        return None
+    conn = _connect()
+    try:
+        cur = conn.execute(
+            "SELECT log_path, offset FROM log_index WHERE stage = ? AND silver_path = ?",
+            (stage, silver_path),
+        )
+        row = cur.fetchone()
+        return (row[0], int(row[1])) if row else None
+    finally:
+        conn.close()
 
 
 def log_event(
@@ -12,15 +67,18 @@ def log_event(
         run_id: Optional[str] = None,
         task_id: Optional[str] = None,
         metrics: Optional[Dict[str, Any]] = None,) -> str:
-    """Write a single JSON log with structured metadata and a metrics object.
+    """Append one JSON line with structured metadata and a metrics object.
 
-    Returns the path to the JSON file written.
+    Events go into a per-stage, daily-rotated JSONL file instead of one file
+    per call. If metrics carry a silver_path, the (file, offset) of the line
+    is upserted into a small sqlite index so readers can seek straight to it.
+    Returns the path to the JSONL file appended to.
     """
-    out_dir = "/opt/airflow/data/logging"
+    out_dir = OUT_DIR
     os.makedirs(out_dir, exist_ok=True)
 
-    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    filename = f"log_{timestamp}_{stage}.json"
+    date = datetime.utcnow().strftime("%Y%m%d")
+    filename = f"events_{stage}_{date}.jsonl"
     out_path = os.path.join(out_dir, filename)
 
     row = {
@@ -32,7 +90,16 @@ def log_event(
         "metrics": metrics or {},
     }
 
-    with open(out_path, "w", encoding="utf-8") as fh:
-        json.dump(row, fh, ensure_ascii=False, indent=2)
+    with open(out_path, "a", encoding="utf-8") as fh:
+        offset = fh.tell()
+        fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    silver_path = (metrics or {}).get("silver_path")
+    if silver_path:
+        try:
+            index_upsert(stage, silver_path, out_path, offset)
+        except Exception:
+            # index is best-effort; must not fail the pipeline
+            pass
 
     return out_path